@@ -1,55 +1,126 @@
+import os
+
 import voluptuous as vol
-from homeassistant.core import ServiceCall
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import ServiceCall, SupportsResponse
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import STORAGE_DIR
 
 from .const import (
     ATTR_COMMAND,
+    ATTR_LOCAL_PATH,
     ATTR_PC_NAME,
+    ATTR_REMOTE_PATH,
+    ATTR_STRUCTURED,
     ATTR_TIMEOUT,
     DEFAULT_SSH_TIMEOUT,
     DOMAIN,
+    SERVICE_DOWNLOAD_FILE,
     SERVICE_SEND_COMMAND,
+    SERVICE_UPLOAD_FILE,
 )
+from .host import PCHost, async_preload_ssh_stack
 
 
 async def async_setup_entry(hass, config_entry):
     """Set up PC Power Control from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
+    # Import the SSH stack off the event loop so the first command is not
+    # slowed down by it
+    await async_preload_ssh_stack(hass)
+
+    # Shared runtime state of this PC, used by its entities and the services
+    pc = hass.data[DOMAIN][config_entry.entry_id] = PCHost(
+        config_entry.entry_id,
+        {**config_entry.data, **config_entry.options},
+        _known_hosts_path(hass, config_entry),
+    )
+
+    # Cancel background SSH work and close the session when HA stops
+    async def _async_stop_pc(_event):
+        await pc.async_stop()
+
+    config_entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_pc)
+    )
+
     # Forward setup to switch platform
     await hass.config_entries.async_forward_entry_setups(config_entry, ["switch"])
 
-    # Register domain-level SSH command service
-    async def async_send_ssh_command_service(call: ServiceCall):
-        """Handle SSH command service calls."""
-        command = call.data.get(ATTR_COMMAND)
-        timeout = call.data.get(ATTR_TIMEOUT, DEFAULT_SSH_TIMEOUT)
-        pc_name = call.data.get(ATTR_PC_NAME)
+    # Apply options changes to the running entities
+    config_entry.async_on_unload(config_entry.add_update_listener(async_update_options))
+
+    def _get_pc(pc_name):
+        """Return the PC named pc_name, or the only configured PC.
 
-        # Find the appropriate switch
-        switches = hass.data[DOMAIN].get("switches", {})
+        pc_name may also be a config entry id, which stays unambiguous when
+        several PCs share the same name.
+        """
+        pcs = [pc for pc in hass.data[DOMAIN].values() if isinstance(pc, PCHost)]
+        available = [pc.name for pc in pcs]
 
         if pc_name:
             # Use specified PC
-            switch = switches.get(pc_name)
-            if not switch:
+            if (pc := hass.data[DOMAIN].get(pc_name)) is not None:
+                return pc
+            matches = [pc for pc in pcs if pc.name == pc_name]
+            if not matches:
                 raise ValueError(
-                    f"PC '{pc_name}' not found. Available PCs: {list(switches.keys())}"
+                    f"PC '{pc_name}' not found. Available PCs: {available}"
                 )
-        else:
-            # Use the first (or only) PC if not specified
-            if not switches:
-                raise ValueError("No PC Power Control switches configured")
-            if len(switches) > 1:
+            if len(matches) > 1:
                 raise ValueError(
-                    f"Multiple PCs configured. Please specify pc_name. Available: {list(switches.keys())}"
+                    f"Multiple PCs are named '{pc_name}'. Please use the config entry id as pc_name: {[pc.entry_id for pc in matches]}"
                 )
-            switch = next(iter(switches.values()))
+            return matches[0]
+
+        # Use the first (or only) PC if not specified
+        if not pcs:
+            raise ValueError("No PC Power Control switches configured")
+        if len(pcs) > 1:
+            raise ValueError(
+                f"Multiple PCs configured. Please specify pc_name. Available: {available}"
+            )
+        return pcs[0]
+
+    def _check_local_path(path):
+        """Only allow transfers to and from allowlisted local directories."""
+        if not hass.config.is_allowed_path(path):
+            raise ValueError(
+                f"Local path '{path}' is not in allowlist_external_dirs"
+            )
+
+    # Register domain-level SSH command service
+    async def async_send_ssh_command_service(call: ServiceCall):
+        """Handle SSH command service calls."""
+        command = call.data.get(ATTR_COMMAND)
+        timeout = call.data.get(ATTR_TIMEOUT, DEFAULT_SSH_TIMEOUT)
+        structured = call.data.get(ATTR_STRUCTURED, False)
+        pc = _get_pc(call.data.get(ATTR_PC_NAME))
 
         # Execute the command
-        result = await switch.async_send_ssh_command(command, timeout)
+        result = await pc.async_send_ssh_command(command, timeout, structured)
         return result
 
+    async def async_upload_file_service(call: ServiceCall):
+        """Handle SFTP upload service calls."""
+        local_path = call.data[ATTR_LOCAL_PATH]
+        _check_local_path(local_path)
+        pc = _get_pc(call.data.get(ATTR_PC_NAME))
+        return await pc.async_upload_file(
+            local_path, call.data[ATTR_REMOTE_PATH], call.data.get(ATTR_TIMEOUT)
+        )
+
+    async def async_download_file_service(call: ServiceCall):
+        """Handle SFTP download service calls."""
+        local_path = call.data[ATTR_LOCAL_PATH]
+        _check_local_path(local_path)
+        pc = _get_pc(call.data.get(ATTR_PC_NAME))
+        return await pc.async_download_file(
+            call.data[ATTR_REMOTE_PATH], local_path, call.data.get(ATTR_TIMEOUT)
+        )
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_SEND_COMMAND,
@@ -61,20 +132,91 @@ async def async_setup_entry(hass, config_entry):
                     ATTR_TIMEOUT, default=DEFAULT_SSH_TIMEOUT
                 ): cv.positive_int,
                 vol.Optional(ATTR_PC_NAME): cv.string,
+                vol.Optional(ATTR_STRUCTURED, default=False): cv.boolean,
             }
         ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    transfer_schema = vol.Schema(
+        {
+            vol.Required(ATTR_LOCAL_PATH): cv.string,
+            vol.Required(ATTR_REMOTE_PATH): cv.string,
+            vol.Optional(ATTR_TIMEOUT): cv.positive_int,
+            vol.Optional(ATTR_PC_NAME): cv.string,
+        }
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UPLOAD_FILE,
+        async_upload_file_service,
+        schema=transfer_schema,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DOWNLOAD_FILE,
+        async_download_file_service,
+        schema=transfer_schema,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     return True
 
 
+def _known_hosts_path(hass, config_entry):
+    """Return the file persisting the SSH host key of an entry's PC."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}.{config_entry.entry_id}.known_hosts")
+
+
+async def async_update_options(hass, config_entry):
+    """Apply updated options to the running entities.
+
+    Changes to identifying options (see RELOAD_OPTIONS) reload the entry; all
+    other changes are applied to the shared PCHost, which drops its SSH
+    connection only if credentials or port changed, and entities rebuild
+    their poll scheduler only if the poll interval changed.
+    """
+    pc = hass.data[DOMAIN].get(config_entry.entry_id)
+    config = {**config_entry.data, **config_entry.options}
+
+    if pc is None or pc.requires_reload(config):
+        await hass.config_entries.async_reload(config_entry.entry_id)
+        return
+
+    changed = await pc.async_apply_options(config)
+    if "poll_interval" in changed:
+        for entity in pc.entities:
+            entity.async_poll_interval_changed()
+
+
 async def async_unload_entry(hass, config_entry):
     """Unload a config entry."""
-    # Remove service
-    hass.services.async_remove(DOMAIN, SERVICE_SEND_COMMAND)
+    unloaded = await hass.config_entries.async_forward_entry_unload(
+        config_entry, "switch"
+    )
 
     # Clean up stored data
     if DOMAIN in hass.data:
-        hass.data[DOMAIN].pop(config_entry.entry_id, None)
+        pc = hass.data[DOMAIN].pop(config_entry.entry_id, None)
+        if pc is not None:
+            await pc.async_stop()
+
+    # The services are shared by all PCs; keep them while any is still loaded
+    if not any(isinstance(pc, PCHost) for pc in hass.data.get(DOMAIN, {}).values()):
+        hass.services.async_remove(DOMAIN, SERVICE_SEND_COMMAND)
+        hass.services.async_remove(DOMAIN, SERVICE_UPLOAD_FILE)
+        hass.services.async_remove(DOMAIN, SERVICE_DOWNLOAD_FILE)
+
+    return unloaded
+
+
+async def async_remove_entry(hass, config_entry):
+    """Forget the stored SSH host key when a PC is removed."""
+    path = _known_hosts_path(hass, config_entry)
+
+    def _remove():
+        if os.path.exists(path):
+            os.remove(path)
 
-    return await hass.config_entries.async_forward_entry_unload(config_entry, "switch")
+    await hass.async_add_executor_job(_remove)
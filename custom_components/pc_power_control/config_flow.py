@@ -1,8 +1,18 @@
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
 
-from .const import DOMAIN
+from .const import DEFAULT_POLL_INTERVAL, DOMAIN, MIN_POLL_INTERVAL
+from .host import load_private_key
+
+# Validators for the numeric options, shared with the options flow
+SSH_PORT_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=1, max=65535))
+SSH_TIMEOUT_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=1, max=300))
+POLL_INTERVAL_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=MIN_POLL_INTERVAL))
+
+# Private keys are pasted as the full multi-line key file
+PRIVATE_KEY_SELECTOR = TextSelector(TextSelectorConfig(multiline=True))
 
 CONFIG_SCHEMA = vol.Schema(
     {
@@ -10,24 +20,54 @@ CONFIG_SCHEMA = vol.Schema(
         vol.Required("host"): str,
         vol.Required("mac"): str,
         vol.Required("username"): str,
-        vol.Required("password"): str,
-        vol.Optional("ssh_port", default=22): int,
-        vol.Optional("ssh_timeout", default=30): int,
+        vol.Optional("password", default=""): str,
+        vol.Optional("private_key", default=""): PRIVATE_KEY_SELECTOR,
+        vol.Optional("private_key_passphrase", default=""): str,
+        vol.Optional("ssh_port", default=22): SSH_PORT_VALIDATOR,
+        vol.Optional("ssh_timeout", default=30): SSH_TIMEOUT_VALIDATOR,
+        vol.Optional(
+            "poll_interval", default=DEFAULT_POLL_INTERVAL
+        ): POLL_INTERVAL_VALIDATOR,
     }
 )
 
 
+async def async_validate_credentials(hass, user_input) -> dict:
+    """Check that a password or a valid private key is configured.
+
+    Returns
+    -------
+    dict
+        Form errors, empty if the credentials are usable.
+    """
+    errors = {}
+    if user_input.get("private_key"):
+        try:
+            await hass.async_add_executor_job(
+                load_private_key,
+                user_input["private_key"],
+                user_input.get("private_key_passphrase"),
+            )
+        except Exception:
+            errors["private_key"] = "invalid_private_key"
+    elif not user_input.get("password"):
+        errors["base"] = "auth_required"
+    return errors
+
+
 class PCPowerControlConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(self, user_input=None):
         errors = {}
         if user_input is not None:
             await self.async_set_unique_id(user_input["mac"])
             self._abort_if_unique_id_configured()
-            return self.async_create_entry(
-                title=user_input["name"],
-                data=user_input,
-                options=user_input,
-            )
+            errors = await async_validate_credentials(self.hass, user_input)
+            if not errors:
+                return self.async_create_entry(
+                    title=user_input["name"],
+                    data=user_input,
+                    options=user_input,
+                )
 
         return self.async_show_form(
             step_id="user", data_schema=CONFIG_SCHEMA, errors=errors
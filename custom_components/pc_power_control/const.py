@@ -3,13 +3,23 @@ DOMAIN = "pc_power_control"
 # Services
 SERVICE_SEND_COMMAND = "send_ssh_command"
 
+SERVICE_UPLOAD_FILE = "upload_file"
+SERVICE_DOWNLOAD_FILE = "download_file"
+
 # Service attributes
 ATTR_COMMAND = "command"
 ATTR_TIMEOUT = "timeout"
 ATTR_PC_NAME = "pc_name"
+ATTR_STRUCTURED = "structured"
+ATTR_LOCAL_PATH = "local_path"
+ATTR_REMOTE_PATH = "remote_path"
 
 # Default values
 DEFAULT_SSH_TIMEOUT = 30
+# Seconds between state refreshes of each entity
+DEFAULT_POLL_INTERVAL = 30
+# Shortest poll interval accepted, to keep polling from flooding the PCs
+MIN_POLL_INTERVAL = 5
 # Number of seconds to consider the PC "booting" after a Wake-on-LAN packet
 # During this window, the integration will treat the PC as ON to avoid a
 # premature ping-based off state while the machine boots.
@@ -17,23 +27,82 @@ DEFAULT_BOOT_GRACE = 60
 # How long (seconds) to hold the monitor switch state after issuing a change
 # to allow the remote OS to apply the setting before re-querying.
 DEFAULT_MONITOR_PROPAGATION_GRACE = 10
+# Seconds between reachability probes while waiting for a shutdown to complete.
+DEFAULT_SHUTDOWN_PROBE_INTERVAL = 1
+# Consecutive unanswered probes needed to confirm a shutdown, so a single
+# dropped ping is not mistaken for the PC going down.
+SHUTDOWN_CONFIRM_PROBES = 3
+# Deadline (seconds) for a shutdown to complete before any duration is learned.
+DEFAULT_SHUTDOWN_TIMEOUT = 120
+# Once shutdown durations have been learned for a host, the deadline is the
+# learned duration times this factor, but never less than the minimum below.
+SHUTDOWN_DEADLINE_FACTOR = 3
+SHUTDOWN_DEADLINE_MIN = 30
+# Weight given to the newest sample when updating the learned shutdown duration.
+SHUTDOWN_LEARNING_RATE = 0.3
+# SFTP transfers are streamed in chunks of this many bytes; downloads keep at
+# most SFTP_MAX_REQUESTS read requests in flight at once.
+SFTP_CHUNK_SIZE = 32768
+SFTP_MAX_REQUESTS = 64
+# Maximum number of simultaneous file transfers per PC
+DEFAULT_MAX_TRANSFERS = 2
+# Cached results of remote configuration queries are re-fetched after this many
+# seconds even if the change probe reports no change.
+DEFAULT_REMOTE_QUERY_MAX_AGE = 600
+# Once a PC is being woken or is seen online, an SSH session is opened in the
+# background so the first command does not pay for connect and authentication.
+# Connection attempts (each limited to SSH_PREWARM_CONNECT_TIMEOUT seconds) are
+# retried every SSH_PREWARM_RETRY_INTERVAL seconds for up to SSH_PREWARM_TIMEOUT.
+SSH_PREWARM_TIMEOUT = 180
+SSH_PREWARM_RETRY_INTERVAL = 2
+SSH_PREWARM_CONNECT_TIMEOUT = 5
+# Remote refreshes are held back until Home Assistant has finished starting,
+# then released at a random offset within this window (seconds) so that many
+# PCs do not all ping and open SSH sessions at the same moment.
+DEFAULT_STARTUP_STAGGER = 30
+
+# Options that identify the PC's entities. Changing any of them reloads the
+# config entry; every other option is applied to the running entities.
+RELOAD_OPTIONS = ("name", "host", "mac")
+
+# Events
+EVENT_SHUTDOWN_FAILED = f"{DOMAIN}_shutdown_failed"
 
-import base64
+# Power states exposed through the power switch's attributes
+POWER_STATE_ON = "on"
+POWER_STATE_OFF = "off"
+POWER_STATE_SHUTTING_DOWN = "shutting_down"
+
+from .powershell import json_command
 
 # Monitor timeout switch
 MONITOR_TIMEOUT_ENABLED_COMMAND = "powercfg -change -monitor-timeout-ac 30"
 MONITOR_TIMEOUT_DISABLED_COMMAND = "powercfg -change -monitor-timeout-ac 0"
 
-_MONITOR_TIMEOUT_POWERSHELL_SCRIPT = (
-    "$s=(powercfg -getactivescheme); "
-    "if ($s -match '([0-9a-f\\-]{36})') { "
-    "  $guid=$matches[1]; "
-    "  $val=(powercfg -query $guid | Select-String -Pattern '7516b95f-f776-4464-8c53-06167f40cc99|3c0bc021-c8a8-4e07-a973-6b14cbcb2b7e' "
-    "    | ForEach-Object { ($_ -split ':')[-1].Trim() } | Select-Object -First 1); "
-    "  if ($val) { [int]$val / 60 } "
+# "Turn off display after" power setting
+MONITOR_TIMEOUT_SETTING_GUID = "3c0bc021-c8a8-4e07-a973-6b14cbcb2b7e"
+
+# Reads the active power scheme and its display timeouts (seconds) from the
+# power management CIM classes, returned in a single structured result.
+MONITOR_STATUS_SCRIPT = (
+    "$p=Get-CimInstance -Namespace root/cimv2/power -ClassName Win32_PowerPlan "
+    "-Filter 'IsActive=True'; "
+    r"$g=$p.InstanceID -replace '^.*\{|\}$',''; "
+    "$s=Get-CimInstance -Namespace root/cimv2/power "
+    "-ClassName Win32_PowerSettingDataIndex "
+    f"-Filter \"InstanceID LIKE '%$g%{MONITOR_TIMEOUT_SETTING_GUID}%'\"; "
+    "[pscustomobject]@{"
+    "scheme=$g; "
+    "scheme_name=$p.ElementName; "
+    r"monitor_timeout_ac=($s | Where-Object {$_.InstanceID -like '*\AC\*'}).SettingIndexValue; "
+    r"monitor_timeout_dc=($s | Where-Object {$_.InstanceID -like '*\DC\*'}).SettingIndexValue"
     "}"
 )
 
-_MONITOR_TIMEOUT_ENC = base64.b64encode(_MONITOR_TIMEOUT_POWERSHELL_SCRIPT.encode('utf-16le')).decode('ascii')
-MONITOR_TIMEOUT_CHECK_COMMAND = f"powershell -NoProfile -NonInteractive -EncodedCommand {_MONITOR_TIMEOUT_ENC}"
+MONITOR_TIMEOUT_CHECK_COMMAND = json_command(MONITOR_STATUS_SCRIPT)
 
+# Cheap change probe for the monitor status: a single native powercfg call
+# (no PowerShell start-up) printing the active scheme GUID and the display
+# timeout indices. Its output is fingerprinted; the full structured query only
+# runs when the fingerprint changes.
+MONITOR_STATUS_PROBE_COMMAND = "powercfg /query SCHEME_CURRENT SUB_VIDEO VIDEOIDLE"
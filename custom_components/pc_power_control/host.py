@@ -0,0 +1,881 @@
+import asyncio
+import hashlib
+import importlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+from asyncio.subprocess import PIPE
+
+from .const import (
+    DEFAULT_MAX_TRANSFERS,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_REMOTE_QUERY_MAX_AGE,
+    DEFAULT_SSH_TIMEOUT,
+    DOMAIN,
+    RELOAD_OPTIONS,
+    SFTP_CHUNK_SIZE,
+    SFTP_MAX_REQUESTS,
+    SSH_PREWARM_CONNECT_TIMEOUT,
+    SSH_PREWARM_RETRY_INTERVAL,
+    SSH_PREWARM_TIMEOUT,
+)
+from .powershell import json_command, parse_json_output
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_preload_ssh_stack(hass):
+    """Import the SSH library in the executor.
+
+    paramiko pulls in the cryptography backends, which is slow enough to
+    block the event loop and to delay the first command to a PC.
+    """
+    await hass.async_add_executor_job(importlib.import_module, "paramiko")
+
+
+def load_private_key(key_text: str, passphrase: str = None):
+    """Parse a PEM/OpenSSH private key of any type paramiko supports.
+
+    Parameters
+    ----------
+    key_text : str
+        The private key file contents.
+    passphrase : str, optional
+        Passphrase protecting the key.
+
+    Returns
+    -------
+    paramiko.PKey
+        The parsed key.
+
+    Raises
+    ------
+    ValueError
+        If the key cannot be parsed with any supported key type.
+    """
+    import paramiko
+
+    for key_class in (paramiko.Ed25519Key, paramiko.ECDSAKey, paramiko.RSAKey):
+        try:
+            return key_class.from_private_key(
+                io.StringIO(key_text), password=passphrase or None
+            )
+        except paramiko.SSHException:
+            continue
+    raise ValueError("Unsupported or invalid private key")
+
+
+# Options that require a new SSH connection when changed
+_CONNECTION_OPTIONS = {
+    "username",
+    "password",
+    "private_key",
+    "private_key_passphrase",
+    "ssh_port",
+}
+
+
+class PCHost:
+    """Runtime state of one configured PC.
+
+    A single instance exists per config entry, registered in
+    ``hass.data[DOMAIN][entry_id]``. Both switch entities and the domain
+    services read connection settings and timing state from it, and all
+    remote I/O (ping, SSH, SFTP) goes through it.
+
+    Timestamps are monotonic seconds from ``time.monotonic()``, the same clock
+    the event loop uses.
+    """
+
+    __slots__ = (
+        "entry_id",
+        "name",
+        "host",
+        "mac",
+        "username",
+        "password",
+        "private_key",
+        "private_key_passphrase",
+        "ssh_port",
+        "ssh_timeout",
+        "poll_interval",
+        "known_hosts_path",
+        "pkey",
+        "auth_method",
+        "ssh_client",
+        "ssh_lock",
+        "prewarm_task",
+        "prewarm_blocked",
+        "transfer_semaphore",
+        "last_wol_time",
+        "force_on_until",
+        "propagation_grace_until",
+        "last_command_time",
+        "entities",
+    )
+
+    def __init__(self, entry_id: str, config: dict, known_hosts_path: str = None):
+        """Initialize the host state.
+
+        Parameters
+        ----------
+        entry_id : str
+            The config entry this PC belongs to.
+        config : dict
+            The entry's data merged with its options.
+        known_hosts_path : str, optional
+            File persisting this PC's SSH host key. The first key seen is
+            stored and any later mismatch is rejected. If None, host keys are
+            only kept in memory.
+
+        Examples
+        --------
+        >>> pc = PCHost("entry_id", {"name": "My PC", "host": "192.168.1.100",
+        ...     "mac": "aa:bb:cc:dd:ee:ff", "username": "user", "password": "pass"})
+        """
+        self.entry_id = entry_id
+        self.name = config["name"]
+        self.host = config["host"]
+        self.mac = config["mac"]
+        self._set_options(config)
+        self.known_hosts_path = known_hosts_path
+        # Parsed key and the authentication method that last succeeded, both
+        # derived from the credentials and reset when they change
+        self.pkey = None
+        self.auth_method = None
+
+        # Persistent SSH client to reduce connection overhead for repeated commands
+        self.ssh_client = None
+        # Serializes opening the persistent client across executor threads
+        self.ssh_lock = threading.Lock()
+        # Background task opening the SSH session while the PC boots
+        self.prewarm_task = None
+        # Set when pre-warming failed in a way retrying cannot fix, until the
+        # connection options change
+        self.prewarm_blocked = False
+        # Limits simultaneous SFTP transfers to this PC
+        self.transfer_semaphore = asyncio.Semaphore(DEFAULT_MAX_TRANSFERS)
+        # Timestamp of last Wake-on-LAN packet sent
+        self.last_wol_time = None
+        # Timestamp until which the power switch is forced ON while booting
+        self.force_on_until = None
+        # Timestamp until which the monitor setting is not re-queried
+        self.propagation_grace_until = None
+        # Timestamp of the last monitor setting change
+        self.last_command_time = None
+        # Entities of this PC, notified when options change
+        self.entities = []
+
+    def _set_options(self, config: dict):
+        """Copy the tunable options from config."""
+        self.username = config["username"]
+        self.password = config.get("password", "")
+        self.private_key = config.get("private_key", "")
+        self.private_key_passphrase = config.get("private_key_passphrase", "")
+        self.ssh_port = config.get("ssh_port", 22)
+        self.ssh_timeout = config.get("ssh_timeout", DEFAULT_SSH_TIMEOUT)
+        self.poll_interval = config.get("poll_interval", DEFAULT_POLL_INTERVAL)
+
+    def requires_reload(self, config: dict) -> bool:
+        """Return True if config changes an option that identifies the PC."""
+        return any(config.get(key) != getattr(self, key) for key in RELOAD_OPTIONS)
+
+    async def async_apply_options(self, config: dict) -> set:
+        """Apply changed tunable options.
+
+        New credentials or a new port drop the SSH connection so the next
+        command reconnects with them.
+
+        Returns
+        -------
+        set
+            Names of the options that changed.
+        """
+        changed = await asyncio.get_running_loop().run_in_executor(
+            None, self._apply_options_sync, config
+        )
+        if changed & _CONNECTION_OPTIONS:
+            self.prewarm_blocked = False
+        return changed
+
+    def _apply_options_sync(self, config: dict) -> set:
+        """Apply options while no connection is being opened.
+
+        Holding ssh_lock keeps executor threads from connecting with a mix of
+        old and new credentials or caching an auth method for the old ones.
+        """
+        client = None
+        with self.ssh_lock:
+            before = {
+                "username": self.username,
+                "password": self.password,
+                "private_key": self.private_key,
+                "private_key_passphrase": self.private_key_passphrase,
+                "ssh_port": self.ssh_port,
+                "ssh_timeout": self.ssh_timeout,
+                "poll_interval": self.poll_interval,
+            }
+            self._set_options(config)
+            changed = {
+                key for key, value in before.items() if getattr(self, key) != value
+            }
+            if changed & _CONNECTION_OPTIONS:
+                self.pkey = None
+                self.auth_method = None
+                client, self.ssh_client = self.ssh_client, None
+
+        if client is not None:
+            client.close()
+        return changed
+
+    async def async_close_ssh_client(self):
+        """Close the persistent SSH client so the next command reconnects."""
+        client, self.ssh_client = self.ssh_client, None
+        if client is not None:
+            await asyncio.get_running_loop().run_in_executor(None, client.close)
+
+    async def async_stop(self):
+        """Cancel background work and close the SSH session."""
+        if self.prewarm_task is not None and not self.prewarm_task.done():
+            self.prewarm_task.cancel()
+        self.prewarm_task = None
+        await self.async_close_ssh_client()
+
+    @property
+    def ssh_connected(self) -> bool:
+        """Return True if the persistent SSH session is open."""
+        client = self.ssh_client
+        if client is None:
+            return False
+        transport = client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def async_start_prewarm(self, hass):
+        """Open the SSH session in the background once the PC is reachable.
+
+        Meant to be called when the PC is woken or comes online, not on every
+        poll: a run that gives up is not retried until then. Does nothing if a
+        session is already open or being opened, or if the last attempt was
+        rejected by the PC and the options have not changed since.
+        """
+        if self.prewarm_blocked or self.ssh_connected:
+            return
+        if self.prewarm_task is not None and not self.prewarm_task.done():
+            return
+        # Not tracked by HA, so it does not hold up startup or shutdown
+        self.prewarm_task = hass.async_create_background_task(
+            self._async_prewarm(), f"{DOMAIN} SSH pre-warm {self.host}"
+        )
+
+    async def _async_prewarm(self):
+        """Retry opening the SSH session until it succeeds or times out.
+
+        Connection attempts only start once the PC answers pings, and each is
+        short so that the session is ready soon after the SSH service starts.
+        Only connection errors (refused, timed out, or the SSH service not
+        answering yet) are retried. Rejected credentials or host key stop
+        pre-warming until the connection options change, so that repeated
+        attempts do not lock the account.
+        """
+        import paramiko
+
+        loop = asyncio.get_running_loop()
+        deadline = self.now() + SSH_PREWARM_TIMEOUT
+
+        while self.now() < deadline:
+            if await self.async_ping():
+                try:
+                    await loop.run_in_executor(
+                        None, self._get_client_sync, SSH_PREWARM_CONNECT_TIMEOUT
+                    )
+                    _LOGGER.debug("SSH session to %s ready", self.host)
+                    return
+                except (paramiko.AuthenticationException, ValueError) as e:
+                    _LOGGER.error(
+                        "SSH authentication to %s failed, not retrying until the options change: %s",
+                        self.host,
+                        e,
+                    )
+                    self.prewarm_blocked = True
+                    return
+                except paramiko.BadHostKeyException as e:
+                    _LOGGER.error(
+                        "SSH host key of %s does not match the stored one, not retrying: %s",
+                        self.host,
+                        e,
+                    )
+                    self.prewarm_blocked = True
+                    return
+                except (OSError, paramiko.SSHException) as e:
+                    # Refused, timed out, or no SSH banner yet while booting
+                    _LOGGER.debug("SSH on %s not ready yet: %s", self.host, e)
+                except Exception as e:
+                    _LOGGER.warning(
+                        "Pre-warming SSH session to %s failed: %s", self.host, e
+                    )
+                    return
+            await asyncio.sleep(SSH_PREWARM_RETRY_INTERVAL)
+
+        _LOGGER.debug("Gave up pre-warming SSH session to %s", self.host)
+
+    @staticmethod
+    def now() -> float:
+        """Return the current monotonic time in seconds."""
+        return time.monotonic()
+
+    async def async_ping(self) -> bool:
+        """Return True if the host answers a single ping."""
+        proc = await asyncio.create_subprocess_exec(
+            "ping", "-c", "1", "-W", "1", self.host, stdout=PIPE, stderr=PIPE
+        )
+        await proc.communicate()
+        return proc.returncode == 0
+
+    async def async_send_ssh_command(
+        self, command: str, timeout: int = None, structured: bool = False
+    ) -> dict:
+        """Send a custom SSH command to the remote PC.
+
+        Parameters
+        ----------
+        command : str
+            The command to execute on the remote PC.
+        timeout : int, optional
+            Command execution timeout in seconds. If None, uses configured timeout.
+        structured : bool, optional
+            Run command as a PowerShell script whose result is returned as a
+            single JSON document, parsed into the 'data' key (default is False).
+
+        Returns
+        -------
+        dict
+            A dictionary containing the command result with keys:
+            - 'success': bool indicating if command executed successfully
+            - 'stdout': command standard output
+            - 'stderr': command standard error output
+            - 'return_code': command exit code
+            In structured mode, additionally:
+            - 'data': the parsed result of the script
+            - 'error': error message if the script failed or its output could
+              not be parsed
+
+        Examples
+        --------
+        >>> result = await pc.async_send_ssh_command("ls -la /home")
+        >>> if result['success']:
+        ...     print(f"Command output: {result['stdout']}")
+        >>> result = await pc.async_send_ssh_command(
+        ...     "Get-Volume C | Select-Object SizeRemaining, Size", structured=True
+        ... )
+        >>> result['data']['SizeRemaining']
+        """
+        if structured:
+            command = json_command(command)
+
+        result = await self.async_execute_ssh_command(command, timeout)
+
+        # Return the result for service response
+        response = {
+            "success": result is not None,
+            "stdout": result.get("stdout", "") if result else "",
+            "stderr": result.get("stderr", "") if result else "",
+            "return_code": result.get("return_code", -1) if result else -1,
+        }
+        if structured:
+            data, error = (
+                parse_json_output(response["stdout"])
+                if result
+                else (None, "SSH command execution failed")
+            )
+            response["success"] = response["success"] and error is None
+            response["data"] = data
+            response["error"] = error or ""
+        return response
+
+    async def async_query_json(self, command: str, timeout: int = None):
+        """Run a command built with json_command and return its parsed result.
+
+        Parameters
+        ----------
+        command : str
+            Command line produced by powershell.json_command.
+        timeout : int, optional
+            SSH connection and command timeout in seconds.
+
+        Returns
+        -------
+        Any | None
+            The script's result, or None if it could not be obtained. A script
+            returning nothing (``data`` is null) is also reported as None, so
+            queries must always produce a value.
+        """
+        result = await self.async_execute_ssh_command(command, timeout)
+        if not result:
+            return None
+
+        data, error = parse_json_output(result.get("stdout", ""))
+        if error:
+            _LOGGER.debug("Structured query on %s failed: %s", self.host, error)
+            return None
+        return data
+
+    async def async_execute_ssh_command(
+        self, command: str, timeout: int = None
+    ) -> dict | None:
+        """Execute a command on the remote PC via SSH.
+
+        Parameters
+        ----------
+        command : str
+            The command to execute.
+        timeout : int, optional
+            SSH connection and command timeout in seconds.
+
+        Returns
+        -------
+        dict | None
+            Dictionary with stdout, stderr, and return_code if successful, None if failed.
+        """
+        if timeout is None:
+            timeout = self.ssh_timeout
+
+        # A session being opened in the background is used as soon as it is
+        # ready instead of racing it with a second connection attempt. The
+        # wait counts against the timeout.
+        prewarm = self.prewarm_task
+        if prewarm is not None and not prewarm.done():
+            started = self.now()
+            await asyncio.wait({prewarm}, timeout=timeout)
+            timeout -= self.now() - started
+            if timeout <= 0:
+                _LOGGER.error("Timed out waiting for SSH session to %s", self.host)
+                return None
+
+        try:
+            _LOGGER.debug("Executing SSH command on %s: %s", self.host, command)
+
+            # Run SSH connection in executor to avoid blocking
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                None, self._ssh_execute_sync, command, timeout
+            )
+
+            if result:
+                _LOGGER.debug("SSH command executed successfully")
+                _LOGGER.debug("Command stdout: %s", result.get("stdout", ""))
+                if result.get("stderr"):
+                    _LOGGER.debug("Command stderr: %s", result["stderr"])
+            else:
+                _LOGGER.error("SSH command execution failed")
+
+            return result
+
+        except Exception as e:
+            _LOGGER.error("SSH command execution error: %s", e)
+            return None
+
+    def _ssh_connect_sync(self, timeout: int):
+        """Open and authenticate an SSH connection to the remote PC.
+
+        Parameters
+        ----------
+        timeout : int
+            SSH connection timeout in seconds.
+
+        Returns
+        -------
+        paramiko.SSHClient
+            The connected client.
+
+        Notes
+        -----
+        Only the configured key and password are offered (no agent or local
+        key files), and once a method has succeeded only that one is offered
+        on later connections, so reconnects skip failing auth attempts. With
+        a known-hosts file, paramiko also prefers the stored host key type.
+        """
+        import paramiko
+
+        ssh = paramiko.SSHClient()
+        if self.known_hosts_path:
+            # Trust on first use: AutoAddPolicy stores the first key seen in
+            # the loaded file; a different key later raises BadHostKeyException
+            if not os.path.exists(self.known_hosts_path):
+                open(self.known_hosts_path, "a").close()
+            ssh.load_host_keys(self.known_hosts_path)
+        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+        if self.private_key and self.pkey is None:
+            self.pkey = load_private_key(
+                self.private_key, self.private_key_passphrase
+            )
+
+        auth_method = self.auth_method
+        password = self.password or None
+        pkey = self.pkey
+        if auth_method == "publickey":
+            password = None
+        elif auth_method == "password":
+            pkey = None
+
+        try:
+            ssh.connect(
+                self.host,
+                port=self.ssh_port,
+                username=self.username,
+                password=password,
+                pkey=pkey,
+                look_for_keys=False,
+                allow_agent=False,
+                timeout=timeout,
+            )
+        except paramiko.AuthenticationException:
+            ssh.close()
+            if auth_method is None:
+                raise
+            # The cached method stopped working; offer every credential again
+            _LOGGER.debug(
+                "Cached %s auth to %s failed, retrying", auth_method, self.host
+            )
+            self.auth_method = None
+            return self._ssh_connect_sync(timeout)
+
+        self.auth_method = getattr(
+            ssh.get_transport().auth_handler, "auth_method", None
+        )
+        return ssh
+
+    def _get_client_sync(self, timeout: int):
+        """Return the persistent SSH client, connecting if needed.
+
+        Parameters
+        ----------
+        timeout : int
+            SSH connection timeout in seconds.
+
+        Returns
+        -------
+        paramiko.SSHClient
+            The shared client. It must not be closed by the caller.
+        """
+        with self.ssh_lock:
+            if self.ssh_connected:
+                return self.ssh_client
+            if self.ssh_client is not None:
+                self.ssh_client.close()
+            self.ssh_client = None
+            self.ssh_client = self._ssh_connect_sync(timeout)
+            return self.ssh_client
+
+    def _drop_client_sync(self, client):
+        """Discard client if it is still the persistent one."""
+        with self.ssh_lock:
+            if self.ssh_client is client:
+                self.ssh_client = None
+        try:
+            client.close()
+        except Exception:
+            pass
+
+    def _ssh_execute_sync(self, command: str, timeout: int) -> dict | None:
+        """Synchronous SSH command execution helper.
+
+        Parameters
+        ----------
+        command : str
+            The command to execute.
+        timeout : int
+            SSH connection timeout in seconds.
+
+        Returns
+        -------
+        dict | None
+            Dictionary with command results or None if failed.
+        """
+        ssh = None
+        try:
+            ssh = self._get_client_sync(timeout)
+            try:
+                stdin, stdout, stderr = ssh.exec_command(command, timeout=timeout)
+            except Exception as e:
+                # The session went stale (e.g. the PC rebooted); reconnect once
+                _LOGGER.debug("Reconnecting stale SSH session to %s: %s", self.host, e)
+                self._drop_client_sync(ssh)
+                ssh = self._get_client_sync(timeout)
+                stdin, stdout, stderr = ssh.exec_command(command, timeout=timeout)
+
+            # Wait for command completion
+            exit_status = stdout.channel.recv_exit_status()
+
+            stdout_text = stdout.read().decode("utf-8", errors="replace").strip()
+            stderr_text = stderr.read().decode("utf-8", errors="replace").strip()
+
+            return {
+                "stdout": stdout_text,
+                "stderr": stderr_text,
+                "return_code": exit_status,
+            }
+
+        except Exception as e:
+            _LOGGER.error("SSH connection/execution error: %s", e)
+            if ssh:
+                self._drop_client_sync(ssh)
+            return None
+
+    async def async_upload_file(
+        self, local_path: str, remote_path: str, timeout: int = None
+    ) -> dict:
+        """Upload a local file to the remote PC over SFTP.
+
+        Parameters
+        ----------
+        local_path : str
+            Path of the file on the Home Assistant host.
+        remote_path : str
+            Destination path on the remote PC.
+        timeout : int, optional
+            SSH connection timeout in seconds. If None, uses configured timeout.
+
+        Returns
+        -------
+        dict
+            Transfer result, see _async_transfer_file.
+        """
+        return await self._async_transfer_file(
+            self._sftp_upload_sync, local_path, remote_path, timeout
+        )
+
+    async def async_download_file(
+        self, remote_path: str, local_path: str, timeout: int = None
+    ) -> dict:
+        """Download a file from the remote PC over SFTP.
+
+        Parameters
+        ----------
+        remote_path : str
+            Path of the file on the remote PC.
+        local_path : str
+            Destination path on the Home Assistant host.
+        timeout : int, optional
+            SSH connection timeout in seconds. If None, uses configured timeout.
+
+        Returns
+        -------
+        dict
+            Transfer result, see _async_transfer_file.
+        """
+        return await self._async_transfer_file(
+            self._sftp_download_sync, local_path, remote_path, timeout
+        )
+
+    async def _async_transfer_file(
+        self, transfer, local_path: str, remote_path: str, timeout: int = None
+    ) -> dict:
+        """Run an SFTP transfer in the executor, limited per PC.
+
+        Returns
+        -------
+        dict
+            A dictionary with keys:
+            - 'success': bool indicating if the transfer completed
+            - 'bytes': number of bytes transferred
+            - 'duration': transfer time in seconds
+            - 'throughput': average throughput in bytes per second
+            - 'error': error message if the transfer failed
+        """
+        if timeout is None:
+            timeout = self.ssh_timeout
+
+        async with self.transfer_semaphore:
+            loop = asyncio.get_running_loop()
+            started = self.now()
+            try:
+                transferred = await loop.run_in_executor(
+                    None, transfer, local_path, remote_path, timeout
+                )
+            except Exception as e:
+                _LOGGER.error(
+                    "SFTP transfer %s <-> %s:%s failed: %s",
+                    local_path,
+                    self.host,
+                    remote_path,
+                    e,
+                )
+                return {
+                    "success": False,
+                    "bytes": 0,
+                    "duration": 0,
+                    "throughput": 0,
+                    "error": str(e),
+                }
+            duration = self.now() - started
+
+        throughput = transferred / duration if duration > 0 else 0
+        _LOGGER.info(
+            "SFTP transfer %s <-> %s:%s: %d bytes in %.2fs (%.0f B/s)",
+            local_path,
+            self.host,
+            remote_path,
+            transferred,
+            duration,
+            throughput,
+        )
+        return {
+            "success": True,
+            "bytes": transferred,
+            "duration": round(duration, 3),
+            "throughput": round(throughput),
+            "error": "",
+        }
+
+    def _sftp_upload_sync(self, local_path: str, remote_path: str, timeout: int) -> int:
+        """Stream a local file to the remote PC in SFTP_CHUNK_SIZE chunks.
+
+        Writes are pipelined, so the next chunk is sent without waiting for the
+        server to acknowledge the previous one. The file is written under a
+        temporary name next to remote_path and only renamed into place once
+        complete, so a failed transfer never leaves a truncated file behind.
+
+        Returns
+        -------
+        int
+            Number of bytes written.
+        """
+        transferred = 0
+        sftp = self._get_client_sync(timeout).open_sftp()
+        try:
+            sftp.get_channel().settimeout(timeout)
+            partial_path = f"{remote_path}.part"
+            with open(local_path, "rb") as src:
+                try:
+                    with sftp.open(partial_path, "wb") as dst:
+                        dst.set_pipelined(True)
+                        while chunk := src.read(SFTP_CHUNK_SIZE):
+                            dst.write(chunk)
+                            transferred += len(chunk)
+                    # Unlike a plain SFTP rename, this replaces an existing file
+                    sftp.posix_rename(partial_path, remote_path)
+                except BaseException:
+                    try:
+                        sftp.remove(partial_path)
+                    except Exception:
+                        # The session may have died with the transfer
+                        pass
+                    raise
+            return transferred
+        finally:
+            sftp.close()
+
+    def _sftp_download_sync(
+        self, local_path: str, remote_path: str, timeout: int
+    ) -> int:
+        """Stream a remote file to the local disk in SFTP_CHUNK_SIZE chunks.
+
+        Reads are prefetched with at most SFTP_MAX_REQUESTS read requests in
+        flight at a time, which keeps the link busy. This does not bound the
+        data received but not yet read. The file is
+        written to a temporary file next to local_path and only moved into
+        place once complete, so a failed transfer never leaves a truncated
+        file behind.
+
+        Returns
+        -------
+        int
+            Number of bytes read.
+        """
+        transferred = 0
+        sftp = self._get_client_sync(timeout).open_sftp()
+        try:
+            sftp.get_channel().settimeout(timeout)
+            fd, partial_path = tempfile.mkstemp(
+                prefix=".", suffix=".part", dir=os.path.dirname(local_path) or "."
+            )
+            try:
+                with os.fdopen(fd, "wb") as dst, sftp.open(remote_path, "rb") as src:
+                    src.prefetch(max_concurrent_requests=SFTP_MAX_REQUESTS)
+                    while chunk := src.read(SFTP_CHUNK_SIZE):
+                        dst.write(chunk)
+                        transferred += len(chunk)
+                os.replace(partial_path, local_path)
+            except BaseException:
+                os.unlink(partial_path)
+                raise
+            return transferred
+        finally:
+            sftp.close()
+
+
+class CachedRemoteQuery:
+    """Structured remote query refreshed only when a cheap probe sees a change.
+
+    Each fetch first runs ``probe_command`` and fingerprints its output. The
+    full ``query_command`` (built with powershell.json_command) only runs when
+    the fingerprint differs from the one seen at the last full query, when no
+    result is cached yet, or when the cached result is older than
+    ``max_age`` seconds. Any entity reading remote configuration can keep one
+    of these per query.
+    """
+
+    __slots__ = (
+        "probe_command",
+        "query_command",
+        "max_age",
+        "fingerprint",
+        "data",
+        "fetched_at",
+    )
+
+    def __init__(
+        self,
+        probe_command: str,
+        query_command: str,
+        max_age: float = DEFAULT_REMOTE_QUERY_MAX_AGE,
+    ):
+        self.probe_command = probe_command
+        self.query_command = query_command
+        self.max_age = max_age
+        self.fingerprint = None
+        self.data = None
+        self.fetched_at = None
+
+    def invalidate(self):
+        """Force the next fetch to run the full query."""
+        self.fingerprint = None
+        self.data = None
+        self.fetched_at = None
+
+    async def async_fetch(self, pc: PCHost):
+        """Return the query result, re-running the full query only if needed.
+
+        Returns
+        -------
+        Any | None
+            The (possibly cached) result, or None if it could not be obtained.
+        """
+        probe = await pc.async_execute_ssh_command(self.probe_command)
+        fingerprint = None
+        if probe and probe.get("return_code") == 0:
+            fingerprint = hashlib.sha1(probe["stdout"].encode("utf-8")).hexdigest()
+
+        now = pc.now()
+        if (
+            fingerprint is not None
+            and fingerprint == self.fingerprint
+            and self.data is not None
+            and now - self.fetched_at < self.max_age
+        ):
+            _LOGGER.debug("Remote state on %s unchanged, using cached result", pc.host)
+            return self.data
+
+        data = await pc.async_query_json(self.query_command)
+        if data is None:
+            self.invalidate()
+            return None
+
+        self.fingerprint = fingerprint
+        self.data = data
+        self.fetched_at = now
+        return data
@@ -1,6 +1,15 @@
 import voluptuous as vol
 from homeassistant import config_entries
 
+from .config_flow import (
+    POLL_INTERVAL_VALIDATOR,
+    PRIVATE_KEY_SELECTOR,
+    SSH_PORT_VALIDATOR,
+    SSH_TIMEOUT_VALIDATOR,
+    async_validate_credentials,
+)
+from .const import DEFAULT_POLL_INTERVAL
+
 
 class PCPowerControlOptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry):
@@ -11,8 +20,11 @@ class PCPowerControlOptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_user(self, user_input=None):
         data = {**self.config_entry.data, **self.config_entry.options}
+        errors = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            errors = await async_validate_credentials(self.hass, user_input)
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
 
         return self.async_show_form(
             step_id="user",
@@ -22,11 +34,25 @@ class PCPowerControlOptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Required("host", default=data.get("host", "")): str,
                     vol.Required("mac", default=data.get("mac", "")): str,
                     vol.Required("username", default=data.get("username", "")): str,
-                    vol.Required("password", default=data.get("password", "")): str,
-                    vol.Optional("ssh_port", default=data.get("ssh_port", 22)): int,
+                    vol.Optional("password", default=data.get("password", "")): str,
+                    vol.Optional(
+                        "private_key", default=data.get("private_key", "")
+                    ): PRIVATE_KEY_SELECTOR,
+                    vol.Optional(
+                        "private_key_passphrase",
+                        default=data.get("private_key_passphrase", ""),
+                    ): str,
+                    vol.Optional(
+                        "ssh_port", default=data.get("ssh_port", 22)
+                    ): SSH_PORT_VALIDATOR,
                     vol.Optional(
                         "ssh_timeout", default=data.get("ssh_timeout", 30)
-                    ): int,
+                    ): SSH_TIMEOUT_VALIDATOR,
+                    vol.Optional(
+                        "poll_interval",
+                        default=data.get("poll_interval", DEFAULT_POLL_INTERVAL),
+                    ): POLL_INTERVAL_VALIDATOR,
                 }
             ),
+            errors=errors,
         )
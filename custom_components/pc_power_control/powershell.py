@@ -0,0 +1,57 @@
+import base64
+import json
+
+# Wraps a script so that its result is emitted as a single compact JSON
+# document: {"ok": true, "data": <result>} or {"ok": false, "error": "..."}.
+_JSON_WRAPPER = (
+    "$ProgressPreference='SilentlyContinue'; "
+    "$ErrorActionPreference='Stop'; "
+    "try {{ $o=@{{ok=$true; data=(& {{ {script} }})}} }} "
+    "catch {{ $o=@{{ok=$false; error=$_.Exception.Message}} }}; "
+    "ConvertTo-Json -InputObject $o -Compress -Depth 5"
+)
+
+
+def encode_command(script: str) -> str:
+    """Return a command line running a PowerShell script via -EncodedCommand.
+
+    Encoding avoids any quoting issues between the SSH server's shell and
+    PowerShell.
+    """
+    enc = base64.b64encode(script.encode("utf-16le")).decode("ascii")
+    return f"powershell -NoProfile -NonInteractive -EncodedCommand {enc}"
+
+
+def json_command(script: str) -> str:
+    """Return a command line running script and emitting its result as JSON."""
+    return encode_command(_JSON_WRAPPER.format(script=script))
+
+
+def parse_json_output(output: str):
+    """Parse the JSON document emitted by a json_command.
+
+    Returns
+    -------
+    tuple
+        ``(data, error)``. ``error`` is None on success and a message if the
+        remote script failed or the output was not a JSON document.
+    """
+    output = output.strip()
+    if not output:
+        return None, "No output"
+
+    try:
+        document = json.loads(output)
+    except ValueError:
+        # Anything written to the host before the document ends up in front
+        # of it; the document itself is always the last line.
+        try:
+            document = json.loads(output.splitlines()[-1])
+        except ValueError:
+            return None, f"Output is not JSON: {output[:200]}"
+
+    if not isinstance(document, dict) or "ok" not in document:
+        return None, "Output is not a structured result"
+    if not document["ok"]:
+        return None, document.get("error") or "Remote script failed"
+    return document.get("data"), None
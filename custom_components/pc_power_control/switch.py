@@ -1,132 +1,315 @@
 import asyncio
 import logging
-from asyncio.subprocess import PIPE
+import random
+from datetime import timedelta
 
 import wakeonlan
 from homeassistant.components.switch import SwitchEntity
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
+from homeassistant.helpers.start import async_at_started
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DEFAULT_BOOT_GRACE,
     DEFAULT_MONITOR_PROPAGATION_GRACE,
-    DEFAULT_SSH_TIMEOUT,
+    DEFAULT_SHUTDOWN_PROBE_INTERVAL,
+    DEFAULT_SHUTDOWN_TIMEOUT,
+    DEFAULT_STARTUP_STAGGER,
     DOMAIN,
+    EVENT_SHUTDOWN_FAILED,
+    MIN_POLL_INTERVAL,
+    MONITOR_STATUS_PROBE_COMMAND,
     MONITOR_TIMEOUT_CHECK_COMMAND,
     MONITOR_TIMEOUT_DISABLED_COMMAND,
     MONITOR_TIMEOUT_ENABLED_COMMAND,
+    POWER_STATE_OFF,
+    POWER_STATE_ON,
+    POWER_STATE_SHUTTING_DOWN,
+    SHUTDOWN_CONFIRM_PROBES,
+    SHUTDOWN_DEADLINE_FACTOR,
+    SHUTDOWN_DEADLINE_MIN,
+    SHUTDOWN_LEARNING_RATE,
 )
+from .host import CachedRemoteQuery, PCHost
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up PC Power Control switches."""
-    data = config_entry.data
-
-    # Create main power switch
-    power_switch = PCPowerSwitch(
-        data["name"],
-        data["host"],
-        data["mac"],
-        data["username"],
-        data["password"],
-        data.get("ssh_port", 22),
-        data.get("ssh_timeout", DEFAULT_SSH_TIMEOUT),
-    )
-
-    # Create monitor timeout switch
-    monitor_switch = PCMonitorTimeoutSwitch(
-        data["name"],
-        data["host"],
-        data["username"],
-        data["password"],
-        data.get("ssh_port", 22),
-        data.get("ssh_timeout", DEFAULT_SSH_TIMEOUT),
-        power_switch,  # Pass reference to power switch
-    )
-
-    async_add_entities([power_switch, monitor_switch])
-
-    # Store switch reference for domain service
-    hass.data[DOMAIN].setdefault("switches", {})
-    hass.data[DOMAIN]["switches"][data["name"]] = power_switch
-
-
-class PCPowerSwitch(SwitchEntity):
+    pc = hass.data[DOMAIN][config_entry.entry_id]
+
+    power_switch = PCPowerSwitch(pc)
+    monitor_switch = PCMonitorTimeoutSwitch(pc, power_switch)
+    pc.entities = [power_switch, monitor_switch]
+
+    async_add_entities(pc.entities)
+
+
+class PCPowerStoredData(ExtraStoredData):
+    """Extra data persisted in Home Assistant's restore-state storage.
+
+    Kept out of the state attributes so per-poll timestamps do not create
+    recorder history.
+    """
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def as_dict(self) -> dict:
+        return self._data
+
+
+def _restored_datetime(extra_data: dict, key: str):
+    """Parse an ISO timestamp stored in restore-state extra data."""
+    value = extra_data.get(key)
+    if not value:
+        return None
+    return dt_util.parse_datetime(value)
+
+
+def _seconds_to_minutes(value):
+    """Convert a power setting value in seconds to whole minutes."""
+    if value is None:
+        return None
+    return int(value) // 60
+
+
+class _PolledEntity:
+    """Mixin giving an entity its own remote-refresh scheduler.
+
+    Polling is not left to the platform: the first refresh is held back until
+    released after Home Assistant has started, then the entity polls at its
+    PC's poll interval, so a changed interval only replaces the timer of the
+    affected entity. Polls that would overlap a still-running update are
+    skipped.
+    """
+
+    _pc: PCHost
+    # Remote refreshes are held back until released after HA startup
+    _refresh_ready = False
+    # Set once the startup delay has passed; see async_release_refresh
+    _refresh_due = False
+    _cancel_poll = None
+    _poll_in_progress = False
+
+    @callback
+    def _async_schedule_first_refresh(self, last_refresh=None):
+        """Release the first remote refresh once Home Assistant has started.
+
+        The release happens at a random offset within DEFAULT_STARTUP_STAGGER
+        so that entities of many PCs spread their first pings and SSH sessions
+        out. If the restored state was refreshed less than a poll interval
+        ago, the release is pushed back until that interval has passed.
+
+        Parameters
+        ----------
+        last_refresh : datetime, optional
+            Restored wall-clock time of the entity's last remote refresh.
+
+        Returns
+        -------
+        callable
+            Callback cancelling the pending release.
+        """
+        cancel_later = None
+
+        @callback
+        def _release(_now):
+            self._refresh_due = True
+            self.async_release_refresh()
+
+        @callback
+        def _at_started(hass):
+            nonlocal cancel_later
+            delay = random.uniform(0, DEFAULT_STARTUP_STAGGER)
+            if last_refresh is not None:
+                age = (dt_util.utcnow() - last_refresh).total_seconds()
+                delay = max(delay, self._pc.poll_interval - age)
+            cancel_later = async_call_later(hass, delay, _release)
+
+        cancel_started = async_at_started(self.hass, _at_started)
+
+        @callback
+        def _cancel():
+            cancel_started()
+            if cancel_later:
+                cancel_later()
+
+        return _cancel
+
+    def _refresh_allowed(self) -> bool:
+        """Return True if nothing else holds back the first refresh."""
+        return True
+
+    @callback
+    def async_release_refresh(self):
+        """Start refreshing once the first refresh is due and allowed.
+
+        Called when the startup delay has passed, and again by whatever
+        _refresh_allowed waits for once it is in place.
+        """
+        if self._refresh_ready or not self._refresh_due:
+            return
+        if not self._refresh_allowed():
+            return
+        self._refresh_ready = True
+        self._async_restart_polling()
+        self.async_schedule_update_ha_state(True)
+
+    @callback
+    def _async_restart_polling(self):
+        """(Re)build the poll scheduler from the PC's current poll interval."""
+        self._async_stop_polling()
+
+        if not self._refresh_ready:
+            return
+
+        async def _poll(_now):
+            if self._poll_in_progress:
+                return
+            self._poll_in_progress = True
+            try:
+                await self.async_update_ha_state(True)
+            finally:
+                self._poll_in_progress = False
+
+        # Entries stored before the option was validated may hold anything
+        interval = max(self._pc.poll_interval, MIN_POLL_INTERVAL)
+        self._cancel_poll = async_track_time_interval(
+            self.hass, _poll, timedelta(seconds=interval)
+        )
+
+    @callback
+    def _async_stop_polling(self):
+        """Cancel the poll scheduler."""
+        if self._cancel_poll:
+            self._cancel_poll()
+            self._cancel_poll = None
+
+    @callback
+    def async_poll_interval_changed(self):
+        """Rebuild the poll scheduler with the PC's new poll interval."""
+        self._async_restart_polling()
+
+    async def async_will_remove_from_hass(self):
+        """Stop polling."""
+        await super().async_will_remove_from_hass()
+        self._async_stop_polling()
+
+
+class PCPowerSwitch(_PolledEntity, SwitchEntity, RestoreEntity):
     """PC Power Control Switch Entity."""
 
-    def __init__(
-        self,
-        name,
-        host,
-        mac,
-        username,
-        password,
-        ssh_port=22,
-        ssh_timeout=DEFAULT_SSH_TIMEOUT,
-    ):
+    def __init__(self, pc: PCHost):
         """Initialize the PC Power Switch.
 
         Parameters
         ----------
-        name : str
-            The friendly name for the switch entity.
-        host : str
-            The IP address or hostname of the remote PC.
-        mac : str
-            The MAC address of the remote PC for Wake-on-LAN.
-        username : str
-            SSH username for remote PC access.
-        password : str
-            SSH password for remote PC access.
-        ssh_port : int, optional
-            SSH port number (default is 22).
-        ssh_timeout : int, optional
-            SSH connection timeout in seconds (default is 30).
+        pc : PCHost
+            Shared runtime state of the PC this switch controls.
 
         Examples
         --------
-        >>> switch = PCPowerSwitch("My PC", "192.168.1.100", "aa:bb:cc:dd:ee:ff", "user", "pass")
+        >>> switch = PCPowerSwitch(hass.data[DOMAIN][entry_id])
         """
-        self._host = host
-        self._mac = mac
-        self._username = username
-        self._password = password
-        self._ssh_port = ssh_port
-        self._ssh_timeout = ssh_timeout
-
-        self._attr_name = name
-        self._attr_should_poll = True
+        self._pc = pc
+
+        self._attr_name = pc.name
+        # Polling is driven by the entity's own scheduler, see _PolledEntity
+        self._attr_should_poll = False
         self._attr_is_on = False
-        self._attr_unique_id = f"pc_power_{mac.replace(':', '').lower()}"
+        self._attr_unique_id = f"pc_power_{pc.mac.replace(':', '').lower()}"
         self._attr_icon = "mdi:desktop-classic"
-        # Persistent SSH client to reduce connection overhead for repeated commands
-        self._ssh_client = None
-        # Timestamp of last Wake-on-LAN packet sent (monotonic seconds)
-        self._last_wol_time = None
-        # Stronger: timestamp until which we force the entity to be ON
-        self._force_on_until = None
+        # Background task probing the host until a requested shutdown completes
+        self._shutdown_task = None
+        # Duration (seconds) of the most recent confirmed shutdown
+        self._last_shutdown_duration = None
+        # Smoothed shutdown duration used to derive the failure deadline
+        self._learned_shutdown_duration = None
+        # Wall-clock time of the last reachability check
+        self._last_checked = None
+        # Set once the host has been pinged since Home Assistant started
+        self._pinged = False
 
     @property
     def is_on(self):
         # Implement logic to check actual PC state
         return self._attr_is_on
 
+    @property
+    def has_pinged(self) -> bool:
+        """Return True once is_on reflects a ping made in this run."""
+        return self._pinged
+
+    @property
+    def shutting_down(self) -> bool:
+        """Return True while a requested shutdown is awaiting confirmation."""
+        return self._shutdown_task is not None and not self._shutdown_task.done()
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the transitional power state and shutdown timing."""
+        if self.shutting_down:
+            power_state = POWER_STATE_SHUTTING_DOWN
+        elif self._attr_is_on:
+            power_state = POWER_STATE_ON
+        else:
+            power_state = POWER_STATE_OFF
+        return {
+            "power_state": power_state,
+            "last_shutdown_duration": self._last_shutdown_duration,
+            "learned_shutdown_duration": self._learned_shutdown_duration,
+        }
+
+    @property
+    def extra_restore_state_data(self) -> PCPowerStoredData:
+        """Return timing data to persist across restarts."""
+        return PCPowerStoredData(
+            {
+                "last_checked": (
+                    self._last_checked.isoformat() if self._last_checked else None
+                ),
+                "last_shutdown_duration": self._last_shutdown_duration,
+                "learned_shutdown_duration": self._learned_shutdown_duration,
+            }
+        )
+
+    async def async_added_to_hass(self):
+        """Restore the last known state and defer the first ping."""
+        await super().async_added_to_hass()
+
+        if (last_state := await self.async_get_last_state()) is not None:
+            self._attr_is_on = last_state.state == STATE_ON
+
+        if (last_extra := await self.async_get_last_extra_data()) is not None:
+            extra = last_extra.as_dict()
+            self._last_checked = _restored_datetime(extra, "last_checked")
+            self._last_shutdown_duration = extra.get("last_shutdown_duration")
+            self._learned_shutdown_duration = extra.get("learned_shutdown_duration")
+
+        self.async_on_remove(self._async_schedule_first_refresh(self._last_checked))
+
+    async def async_will_remove_from_hass(self):
+        """Stop polling and any pending shutdown tracking."""
+        await super().async_will_remove_from_hass()
+        self._cancel_shutdown_tracking()
+
     async def async_turn_on(self, **kwargs):
-        _LOGGER.info("Sending Wake-on-LAN to MAC %s", self._mac)
-        wakeonlan.send_magic_packet(self._mac)
+        _LOGGER.info("Sending Wake-on-LAN to MAC %s", self._pc.mac)
+        self._cancel_shutdown_tracking()
+        wakeonlan.send_magic_packet(self._pc.mac)
         self._attr_is_on = True
         # record monotonic time so we can suppress immediate ping-off checks
-        try:
-            now = asyncio.get_event_loop().time()
-        except Exception:
-            # Fallback to time.monotonic if event loop time unavailable
-            import time as _time
-
-            now = _time.monotonic()
-
-        self._last_wol_time = now
+        now = self._pc.now()
+        self._pc.last_wol_time = now
         # Force ON until this timestamp to protect against race conditions
-        self._force_on_until = now + DEFAULT_BOOT_GRACE
+        self._pc.force_on_until = now + DEFAULT_BOOT_GRACE
+        # Have the SSH session ready by the time the first command arrives
+        self._pc.async_start_prewarm(self.hass)
         # Update HA state immediately so Developer Tools / UI reflect change
         try:
             self.async_write_ha_state()
@@ -137,13 +320,16 @@ class PCPowerSwitch(SwitchEntity):
     async def async_turn_off(self, **kwargs):
         """Turn off the PC by sending a shutdown command via SSH."""
         try:
-            _LOGGER.info("Sending shutdown command to %s via SSH", self._host)
-            result = await self._execute_ssh_command("shutdown -s -f -t 0")
+            _LOGGER.info("Sending shutdown command to %s via SSH", self._pc.host)
+            result = await self._pc.async_execute_ssh_command("shutdown -s -f -t 0")
             if result:
                 self._attr_is_on = False
                 # clear any force-on window
-                self._force_on_until = None
+                self._pc.force_on_until = None
                 _LOGGER.info("Shutdown command executed successfully")
+                # The session dies with the PC; drop it rather than wait for it
+                await self._pc.async_close_ssh_client()
+                self._start_shutdown_tracking()
             else:
                 _LOGGER.error("Failed to execute shutdown command")
         except Exception as e:
@@ -151,215 +337,174 @@ class PCPowerSwitch(SwitchEntity):
 
     async def async_update(self):
         """Update the current state of the PC by pinging it."""
+        # Keep the restored state until the deferred first refresh is released
+        if not self._refresh_ready:
+            return
+
         # If we recently sent a Wake-on-LAN packet, assume the PC is booting
         # and consider it ON for DEFAULT_BOOT_GRACE seconds to avoid flip-flop.
-        try:
-            now = asyncio.get_event_loop().time()
-        except Exception:
-            import time as _time
-
-            now = _time.monotonic()
+        now = self._pc.now()
+        force_on_until = self._pc.force_on_until
 
         # If a force-on timestamp is set and we're still within it, keep ON
-        if self._force_on_until is not None and now < self._force_on_until:
+        if force_on_until is not None and now < force_on_until:
             _LOGGER.debug(
                 "Within force-on window (%.1fs remaining)",
-                self._force_on_until - now,
+                force_on_until - now,
             )
             self._attr_is_on = True
             return
 
-        proc = await asyncio.create_subprocess_exec(
-            "ping", "-c", "1", "-W", "1", self._host, stdout=PIPE, stderr=PIPE
-        )
-        await proc.communicate()
-        self._attr_is_on = proc.returncode == 0
-
-    async def async_send_ssh_command(self, command: str, timeout: int = None) -> dict:
-        """Send a custom SSH command to the remote PC.
-
-        Parameters
-        ----------
-        command : str
-            The command to execute on the remote PC.
-        timeout : int, optional
-            Command execution timeout in seconds. If None, uses configured timeout.
-
-        Returns
-        -------
-        dict
-            A dictionary containing the command result with keys:
-            - 'success': bool indicating if command executed successfully
-            - 'stdout': command standard output
-            - 'stderr': command standard error output
-            - 'return_code': command exit code
-
-        Examples
-        --------
-        >>> result = await switch.async_send_ssh_command("ls -la /home")
-        >>> if result['success']:
-        ...     print(f"Command output: {result['stdout']}")
-        """
-        if timeout is None:
-            timeout = self._ssh_timeout
-
-        result = await self._execute_ssh_command(command, timeout)
-
-        # Return the result for service response
-        return {
-            "success": result is not None,
-            "stdout": result.get("stdout", "") if result else "",
-            "stderr": result.get("stderr", "") if result else "",
-            "return_code": result.get("return_code", -1) if result else -1,
-        }
-
-    async def _execute_ssh_command(
-        self, command: str, timeout: int = None
-    ) -> dict | None:
-        """Execute a command on the remote PC via SSH.
-
-        Parameters
-        ----------
-        command : str
-            The command to execute.
-        timeout : int, optional
-            SSH connection and command timeout in seconds.
-
-        Returns
-        -------
-        dict | None
-            Dictionary with stdout, stderr, and return_code if successful, None if failed.
-        """
-
-        if timeout is None:
-            timeout = self._ssh_timeout
+        # The shutdown tracker owns the state until the shutdown is confirmed
+        if self.shutting_down:
+            _LOGGER.debug("Shutdown of %s in progress, skipping poll", self._pc.host)
+            return
 
-        try:
-            _LOGGER.info("Executing SSH command on %s: %s", self._host, command)
+        was_on = self._attr_is_on
+        self._attr_is_on = await self._pc.async_ping()
+        self._last_checked = dt_util.utcnow()
+        if not self._pinged:
+            self._pinged = True
+            # Entities waiting for a confirmed power state may now refresh
+            for entity in self._pc.entities:
+                if entity is not self:
+                    entity.async_release_refresh()
+        # Only when the PC comes online; a pre-warm that gave up is not
+        # restarted by later polls
+        if self._attr_is_on and not was_on:
+            self._pc.async_start_prewarm(self.hass)
+
+    def _shutdown_deadline(self) -> float:
+        """Return how long (seconds) a shutdown may take before it is considered failed."""
+        if self._learned_shutdown_duration is None:
+            return DEFAULT_SHUTDOWN_TIMEOUT
+        return max(
+            SHUTDOWN_DEADLINE_MIN,
+            self._learned_shutdown_duration * SHUTDOWN_DEADLINE_FACTOR,
+        )
 
-            # Run SSH connection in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None, self._ssh_execute_sync, command, timeout
+    def _record_shutdown_duration(self, duration: float):
+        """Fold a confirmed shutdown duration into the learned estimate."""
+        self._last_shutdown_duration = round(duration, 1)
+        if self._learned_shutdown_duration is None:
+            learned = duration
+        else:
+            learned = (
+                SHUTDOWN_LEARNING_RATE * duration
+                + (1 - SHUTDOWN_LEARNING_RATE) * self._learned_shutdown_duration
             )
-
-            if result:
-                _LOGGER.info("SSH command executed successfully")
-                _LOGGER.debug("Command stdout: %s", result.get("stdout", ""))
-                if result.get("stderr"):
-                    _LOGGER.warning("Command stderr: %s", result["stderr"])
-            else:
-                _LOGGER.error("SSH command execution failed")
-
-            return result
-
-        except Exception as e:
-            _LOGGER.error("SSH command execution error: %s", e)
-            return None
-
-    def _ssh_execute_sync(self, command: str, timeout: int) -> dict | None:
-        """Synchronous SSH command execution helper.
-
-        Parameters
-        ----------
-        command : str
-            The command to execute.
-        timeout : int
-            SSH connection timeout in seconds.
-
-        Returns
-        -------
-        dict | None
-            Dictionary with command results or None if failed.
-        """
-        import paramiko
-
-        ssh = None
+        self._learned_shutdown_duration = round(learned, 1)
+
+    def _start_shutdown_tracking(self):
+        """Start probing the host until it stops answering."""
+        self._cancel_shutdown_tracking()
+        # Not tracked by HA, so it does not hold up startup or shutdown
+        self._shutdown_task = self.hass.async_create_background_task(
+            self._async_track_shutdown(), f"{DOMAIN} shutdown tracker {self._pc.host}"
+        )
         try:
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh.connect(
-                self._host,
-                port=self._ssh_port,
-                username=self._username,
-                password=self._password,
-                timeout=timeout,
-            )
-
-            stdin, stdout, stderr = ssh.exec_command(command, timeout=timeout)
+            self.async_write_ha_state()
+        except Exception:
+            pass
 
-            # Wait for command completion
-            exit_status = stdout.channel.recv_exit_status()
+    def _cancel_shutdown_tracking(self):
+        """Cancel a pending shutdown tracker, if any."""
+        if self._shutdown_task is not None and not self._shutdown_task.done():
+            self._shutdown_task.cancel()
+        self._shutdown_task = None
 
-            stdout_text = stdout.read().decode("utf-8", errors="replace").strip()
-            stderr_text = stderr.read().decode("utf-8", errors="replace").strip()
+    async def _async_track_shutdown(self):
+        """Probe the host at a tight cadence until it stops answering.
 
-            return {
-                "stdout": stdout_text,
-                "stderr": stderr_text,
-                "return_code": exit_status,
-            }
+        The shutdown is confirmed after SHUTDOWN_CONFIRM_PROBES consecutive
+        unanswered probes; the time of the first of them is recorded and used
+        to learn a per-host deadline. If the host is still reachable once the
+        deadline passes, EVENT_SHUTDOWN_FAILED is fired and the switch reverts
+        to ON so regular polling takes over again.
+        """
+        started = self._pc.now()
+        deadline = self._shutdown_deadline()
+        # Elapsed time at the first probe of the current unanswered run
+        silent_since = None
+        missed = 0
+
+        while True:
+            await asyncio.sleep(DEFAULT_SHUTDOWN_PROBE_INTERVAL)
+            elapsed = self._pc.now() - started
+
+            if not await self._pc.async_ping():
+                if silent_since is None:
+                    silent_since = elapsed
+                missed += 1
+                if missed >= SHUTDOWN_CONFIRM_PROBES:
+                    self._record_shutdown_duration(silent_since)
+                    _LOGGER.info(
+                        "Shutdown of %s confirmed after %.1fs",
+                        self._pc.host,
+                        silent_since,
+                    )
+                    self._attr_is_on = False
+                    break
+                continue
+
+            # The host answered again, so any earlier miss was a dropped probe
+            silent_since = None
+            missed = 0
+
+            if elapsed >= deadline:
+                _LOGGER.warning(
+                    "%s still reachable %.1fs after shutdown was requested",
+                    self._pc.host,
+                    elapsed,
+                )
+                self.hass.bus.async_fire(
+                    EVENT_SHUTDOWN_FAILED,
+                    {
+                        "entity_id": self.entity_id,
+                        "host": self._pc.host,
+                        "elapsed": round(elapsed, 1),
+                        "deadline": round(deadline, 1),
+                    },
+                )
+                self._attr_is_on = True
+                break
 
-        except Exception as e:
-            _LOGGER.error("SSH connection/execution error: %s", e)
-            return None
-        finally:
-            if ssh:
-                try:
-                    ssh.close()
-                except Exception:
-                    pass
+        # Mark the tracker finished before publishing the settled state
+        self._shutdown_task = None
+        self.async_write_ha_state()
 
 
-class PCMonitorTimeoutSwitch(SwitchEntity):
+class PCMonitorTimeoutSwitch(_PolledEntity, SwitchEntity, RestoreEntity):
     """Monitor Timeout Control Switch Entity."""
 
-    def __init__(
-        self,
-        pc_name: str,
-        host: str,
-        username: str,
-        password: str,
-        ssh_port: int = 22,
-        ssh_timeout: int = DEFAULT_SSH_TIMEOUT,
-        power_switch: PCPowerSwitch = None,
-    ):
+    def __init__(self, pc: PCHost, power_switch: PCPowerSwitch = None):
         """Initialize the Monitor Timeout Switch.
 
         Parameters
         ----------
-        pc_name : str
-            The name of the PC for entity naming.
-        host : str
-            The IP address or hostname of the remote PC.
-        username : str
-            SSH username for remote PC access.
-        password : str
-            SSH password for remote PC access.
-        ssh_port : int, optional
-            SSH port number (default is 22).
-        ssh_timeout : int, optional
-            SSH connection timeout in seconds (default is 30).
+        pc : PCHost
+            Shared runtime state of the PC this switch controls.
         power_switch : PCPowerSwitch, optional
             Reference to the main power switch for status checking.
         """
-        self._host = host
-        self._username = username
-        self._password = password
-        self._ssh_port = ssh_port
-        self._ssh_timeout = ssh_timeout
+        self._pc = pc
         self._power_switch = power_switch
-        self._pc_name = pc_name
 
-        self._attr_name = f"{pc_name} Monitor Timeout"
-        self._attr_should_poll = True
+        self._attr_name = f"{pc.name} Monitor Timeout"
+        # Polling is driven by the entity's own scheduler, see _PolledEntity
+        self._attr_should_poll = False
         self._attr_is_on = None  # Unknown initially
-        self._attr_unique_id = f"pc_monitor_timeout_{host.replace('.', '_')}"
+        self._attr_unique_id = f"pc_monitor_timeout_{pc.host.replace('.', '_')}"
         self._attr_icon = "mdi:monitor-off"
         self._attr_device_class = None
-        # Time until which we should avoid re-querying the monitor setting
-        self._propagation_grace_until = None
-        self._last_command_time = None
+        # Wall-clock time of the last successful remote query
+        self._last_queried = None
+        # Structured result of the last monitor status query
+        self._monitor_status = {}
+        # Full status query, only re-run when the cheap probe sees a change
+        self._status_query = CachedRemoteQuery(
+            MONITOR_STATUS_PROBE_COMMAND, MONITOR_TIMEOUT_CHECK_COMMAND
+        )
 
     @property
     def available(self) -> bool:
@@ -371,29 +516,74 @@ class PCMonitorTimeoutSwitch(SwitchEntity):
             return self._power_switch.is_on
         return True  # Fallback if no power switch reference
 
+    def _refresh_allowed(self) -> bool:
+        """Hold the first query back until the power switch has pinged the PC.
+
+        Until then, availability rests on the restored power state, and a PC
+        turned off while Home Assistant was down would be queried over SSH.
+        """
+        return self._power_switch is None or self._power_switch.has_pinged
+
     @property
     def is_on(self) -> bool:
         """Return true if monitor timeout is enabled (30 minutes)."""
         return self._attr_is_on
 
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the power scheme and display timeouts (minutes) last read."""
+        status = self._monitor_status
+        return {
+            "power_scheme": status.get("scheme_name"),
+            "timeout_ac_minutes": _seconds_to_minutes(status.get("monitor_timeout_ac")),
+            "timeout_dc_minutes": _seconds_to_minutes(status.get("monitor_timeout_dc")),
+        }
+
+    @property
+    def extra_restore_state_data(self) -> PCPowerStoredData:
+        """Return query timing data to persist across restarts."""
+        return PCPowerStoredData(
+            {
+                "last_queried": (
+                    self._last_queried.isoformat() if self._last_queried else None
+                ),
+            }
+        )
+
+    async def async_added_to_hass(self):
+        """Restore the last known state and defer the first remote query."""
+        await super().async_added_to_hass()
+
+        if (last_state := await self.async_get_last_state()) is not None:
+            if last_state.state in (STATE_ON, STATE_OFF):
+                self._attr_is_on = last_state.state == STATE_ON
+
+        if (last_extra := await self.async_get_last_extra_data()) is not None:
+            self._last_queried = _restored_datetime(
+                last_extra.as_dict(), "last_queried"
+            )
+
+        self.async_on_remove(self._async_schedule_first_refresh(self._last_queried))
+
     async def async_turn_on(self, **kwargs):
         """Turn on monitor timeout (set to 30 minutes)."""
         try:
-            _LOGGER.info("Enabling monitor timeout (30 min) on %s", self._host)
-            result = await self._execute_ssh_command(MONITOR_TIMEOUT_ENABLED_COMMAND)
+            _LOGGER.info("Enabling monitor timeout (30 min) on %s", self._pc.host)
+            result = await self._pc.async_execute_ssh_command(
+                MONITOR_TIMEOUT_ENABLED_COMMAND
+            )
             if result and result.get("return_code") == 0:
                 self._attr_is_on = True
                 _LOGGER.info("Monitor timeout enabled successfully")
                 # Write state immediately for faster UI feedback
                 # set propagation grace so we don't immediately re-query
-                try:
-                    now = asyncio.get_event_loop().time()
-                except Exception:
-                    import time as _time
-
-                    now = _time.monotonic()
-                self._last_command_time = now
-                self._propagation_grace_until = now + DEFAULT_MONITOR_PROPAGATION_GRACE
+                # The setting just changed, so the cached status is stale
+                self._status_query.invalidate()
+                now = self._pc.now()
+                self._pc.last_command_time = now
+                self._pc.propagation_grace_until = (
+                    now + DEFAULT_MONITOR_PROPAGATION_GRACE
+                )
                 self.async_write_ha_state()
             else:
                 _LOGGER.error(
@@ -406,20 +596,21 @@ class PCMonitorTimeoutSwitch(SwitchEntity):
     async def async_turn_off(self, **kwargs):
         """Turn off monitor timeout (disable - never timeout)."""
         try:
-            _LOGGER.info("Disabling monitor timeout on %s", self._host)
-            result = await self._execute_ssh_command(MONITOR_TIMEOUT_DISABLED_COMMAND)
+            _LOGGER.info("Disabling monitor timeout on %s", self._pc.host)
+            result = await self._pc.async_execute_ssh_command(
+                MONITOR_TIMEOUT_DISABLED_COMMAND
+            )
             if result and result.get("return_code") == 0:
                 self._attr_is_on = False
                 _LOGGER.info("Monitor timeout disabled successfully")
                 # Write state immediately for faster UI feedback
-                try:
-                    now = asyncio.get_event_loop().time()
-                except Exception:
-                    import time as _time
-
-                    now = _time.monotonic()
-                self._last_command_time = now
-                self._propagation_grace_until = now + DEFAULT_MONITOR_PROPAGATION_GRACE
+                # The setting just changed, so the cached status is stale
+                self._status_query.invalidate()
+                now = self._pc.now()
+                self._pc.last_command_time = now
+                self._pc.propagation_grace_until = (
+                    now + DEFAULT_MONITOR_PROPAGATION_GRACE
+                )
                 self.async_write_ha_state()
             else:
                 _LOGGER.error(
@@ -431,141 +622,33 @@ class PCMonitorTimeoutSwitch(SwitchEntity):
 
     async def async_update(self):
         """Update the current monitor timeout state."""
+        # Keep the restored state until the deferred first refresh is released
+        if not self._refresh_ready:
+            return
+
         if not self.available:
             self._attr_is_on = None
             return
 
         try:
-            # Query current monitor timeout setting via power switch helper to reuse SSH connection
-            if not self._power_switch:
-                _LOGGER.debug(
-                    "No power switch reference available to query monitor timeout"
-                )
-                return
-
             # If we're within the propagation grace window, avoid re-querying
-            try:
-                now = asyncio.get_event_loop().time()
-            except Exception:
-                import time as _time
-
-                now = _time.monotonic()
-
-            if self._propagation_grace_until and now < self._propagation_grace_until:
+            now = self._pc.now()
+            grace_until = self._pc.propagation_grace_until
+            if grace_until and now < grace_until:
                 _LOGGER.debug(
                     "Within monitor propagation grace (%.1fs remaining)",
-                    self._propagation_grace_until - now,
+                    grace_until - now,
                 )
                 return
 
-            result = await self._power_switch.async_send_ssh_command(
-                MONITOR_TIMEOUT_CHECK_COMMAND, timeout=self._ssh_timeout
-            )
-            if result and result.get("return_code") == 0:
-                output = result.get("stdout", "").strip()
-                # Try to parse output as integer (minutes)
-                try:
-                    timeout_minutes = int(float(output))
-                    self._attr_is_on = timeout_minutes > 0
-                except ValueError:
-                    _LOGGER.debug(f"Could not parse monitor timeout output as integer: {output}")
-                    self._attr_is_on = None
-            else:
+            status = await self._status_query.async_fetch(self._pc)
+            if status is None:
                 _LOGGER.debug("Failed to query monitor timeout status")
-        except Exception as e:
-            _LOGGER.debug(f"Error updating monitor timeout status: {e}")
-
-    async def _execute_ssh_command(
-        self, command: str, timeout: int = None
-    ) -> dict | None:
-        """Execute a command on the remote PC via SSH.
-
-        Parameters
-        ----------
-        command : str
-            The command to execute.
-        timeout : int, optional
-            SSH connection and command timeout in seconds.
-
-        Returns
-        -------
-        dict | None
-            Dictionary with stdout, stderr, and return_code if successful, None if failed.
-        """
-        if timeout is None:
-            timeout = self._ssh_timeout
-
-        try:
-            _LOGGER.debug("Executing SSH command on %s: %s", self._host, command)
-
-            # Run SSH connection in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None, self._ssh_execute_sync, command, timeout
-            )
-
-            if result:
-                _LOGGER.debug("SSH command executed successfully")
-                if result.get("stderr"):
-                    _LOGGER.debug("Command stderr: %s", result["stderr"])
-            else:
-                _LOGGER.debug("SSH command execution failed")
-
-            return result
-
-        except Exception as e:
-            _LOGGER.error("SSH command execution error: %s", e)
-            return None
-
-    def _ssh_execute_sync(self, command: str, timeout: int) -> dict | None:
-        """Synchronous SSH command execution helper.
-
-        Parameters
-        ----------
-        command : str
-            The command to execute.
-        timeout : int
-            SSH connection timeout in seconds.
-
-        Returns
-        -------
-        dict | None
-            Dictionary with command results or None if failed.
-        """
-        import paramiko
-
-        ssh = None
-        try:
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh.connect(
-                self._host,
-                port=self._ssh_port,
-                username=self._username,
-                password=self._password,
-                timeout=timeout,
-            )
-
-            stdin, stdout, stderr = ssh.exec_command(command, timeout=timeout)
-
-            # Wait for command completion
-            exit_status = stdout.channel.recv_exit_status()
-
-            stdout_text = stdout.read().decode("utf-8", errors="replace").strip()
-            stderr_text = stderr.read().decode("utf-8", errors="replace").strip()
-
-            return {
-                "stdout": stdout_text,
-                "stderr": stderr_text,
-                "return_code": exit_status,
-            }
+                return
 
+            self._monitor_status = status
+            self._last_queried = dt_util.utcnow()
+            timeout_ac = status.get("monitor_timeout_ac")
+            self._attr_is_on = None if timeout_ac is None else int(timeout_ac) > 0
         except Exception as e:
-            _LOGGER.error("SSH connection/execution error: %s", e)
-            return None
-        finally:
-            if ssh:
-                try:
-                    ssh.close()
-                except Exception:
-                    pass
+            _LOGGER.debug(f"Error updating monitor timeout status: {e}")
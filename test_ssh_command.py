@@ -8,7 +8,7 @@ import sys
 # Add the custom_components directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "custom_components"))
 
-from pc_power_control.switch import PCPowerSwitch
+from pc_power_control.host import PCHost
 
 
 async def test_ssh_command():
@@ -24,19 +24,11 @@ async def test_ssh_command():
         "ssh_timeout": 30,
     }
 
-    print("Creating PC Power Switch instance...")
-    switch = PCPowerSwitch(
-        TEST_CONFIG["name"],
-        TEST_CONFIG["host"],
-        TEST_CONFIG["mac"],
-        TEST_CONFIG["username"],
-        TEST_CONFIG["password"],
-        TEST_CONFIG["ssh_port"],
-        TEST_CONFIG["ssh_timeout"],
-    )
+    print("Creating PC host instance...")
+    pc = PCHost("test_entry", TEST_CONFIG)
 
     print("Testing SSH command: 'echo Hello from Home Assistant'")
-    result = await switch.async_send_ssh_command("echo Hello from Home Assistant")
+    result = await pc.async_send_ssh_command("echo Hello from Home Assistant")
 
     print("\n=== SSH Command Result ===")
     print(f"Success: {result['success']}")
@@ -69,13 +61,210 @@ def test_monitor_timeout_command_encoding():
 
     dec = base64.b64decode(enc.encode("ascii")).decode("utf-16le")
 
-    assert "powercfg -getactivescheme" in dec
-    assert "7516b95f-f776-4464-8c53-06167f40cc99" in dec
+    assert "Win32_PowerPlan" in dec
     assert "3c0bc021-c8a8-4e07-a973-6b14cbcb2b7e" in dec
+    assert "ConvertTo-Json" in dec
 
     print("✅ Monitor timeout encoded command decodes correctly")
 
 
+def test_json_command_encoding():
+    """Verify json_command wraps the script so its result is emitted as JSON."""
+    import base64
+    from pc_power_control.powershell import json_command
+
+    cmd = json_command("Get-Date")
+    assert "-EncodedCommand" in cmd, "Command should use -EncodedCommand"
+
+    enc = cmd.split("-EncodedCommand", 1)[1].strip()
+    dec = base64.b64decode(enc.encode("ascii")).decode("utf-16le")
+
+    assert "data=(& { Get-Date })" in dec
+    assert "ConvertTo-Json" in dec
+
+    print("✅ JSON command encoded command decodes correctly")
+
+
+def test_parse_json_output():
+    """Verify parse_json_output on successful, failed and malformed output."""
+    from pc_power_control.powershell import parse_json_output
+
+    assert parse_json_output('{"ok":true,"data":{"a":1}}') == ({"a": 1}, None)
+
+    # Anything printed before the document is ignored
+    output = 'Loading profile...\r\n{"ok":true,"data":[1,2]}\r\n'
+    assert parse_json_output(output) == ([1, 2], None)
+
+    assert parse_json_output('{"ok":false,"error":"Access denied"}') == (
+        None,
+        "Access denied",
+    )
+    assert parse_json_output('{"ok":false}') == (None, "Remote script failed")
+
+    # Valid JSON that is not a result document
+    assert parse_json_output("[1,2]")[1] == "Output is not a structured result"
+    assert parse_json_output('"text"')[1] == "Output is not a structured result"
+    assert parse_json_output('{"data":1}')[1] == "Output is not a structured result"
+
+    assert parse_json_output("")[1] == "No output"
+    assert parse_json_output("not json")[1].startswith("Output is not JSON")
+
+    # A script returning nothing succeeds with no data; async_query_json
+    # reports this the same way as a failure (None)
+    assert parse_json_output('{"ok":true,"data":null}') == (None, None)
+    assert parse_json_output('{"ok":true}') == (None, None)
+
+    print("✅ Structured output is parsed correctly")
+
+
+class _StubPC:
+    """Stand-in PCHost answering pings, the probe and the query from fixed values."""
+
+    name = "Stub PC"
+    host = "stub"
+    mac = "aa:bb:cc:dd:ee:ff"
+
+    def __init__(self):
+        # Answers to successive pings, each taking one second; True once empty
+        self.ping_results = []
+        self.probe_output = "scheme A"
+        self.probe_ok = True
+        self.query_result = {"timeout": 10}
+        self.clock = 0.0
+        self.probes = 0
+        self.queries = 0
+
+    def now(self):
+        return self.clock
+
+    async def async_ping(self):
+        self.clock += 1
+        return self.ping_results.pop(0) if self.ping_results else True
+
+    async def async_execute_ssh_command(self, command, timeout=None):
+        self.probes += 1
+        if not self.probe_ok:
+            return None
+        return {"stdout": self.probe_output, "stderr": "", "return_code": 0}
+
+    async def async_query_json(self, command, timeout=None):
+        self.queries += 1
+        return self.query_result
+
+
+def test_cached_remote_query():
+    """Verify CachedRemoteQuery only re-runs the full query when needed."""
+    from pc_power_control.host import CachedRemoteQuery
+
+    async def run():
+        pc = _StubPC()
+        query = CachedRemoteQuery("probe", "query", max_age=60)
+
+        # Same fingerprint and still fresh: cached
+        assert await query.async_fetch(pc) == {"timeout": 10}
+        pc.clock = 30
+        assert await query.async_fetch(pc) == {"timeout": 10}
+        assert (pc.probes, pc.queries) == (2, 1)
+
+        # Different fingerprint: full query
+        pc.probe_output = "scheme B"
+        pc.query_result = {"timeout": 20}
+        assert await query.async_fetch(pc) == {"timeout": 20}
+        assert pc.queries == 2
+
+        # Max age passed: full query
+        pc.clock = 100
+        assert await query.async_fetch(pc) == {"timeout": 20}
+        assert pc.queries == 3
+
+        # Probe failure: full query whose result is not reused
+        pc.probe_ok = False
+        assert await query.async_fetch(pc) == {"timeout": 20}
+        assert await query.async_fetch(pc) == {"timeout": 20}
+        assert pc.queries == 5
+
+        # Query failure: the cache is invalidated
+        pc.probe_ok = True
+        pc.query_result = None
+        assert await query.async_fetch(pc) is None
+        assert query.fingerprint is None and query.data is None
+        pc.query_result = {"timeout": 30}
+        assert await query.async_fetch(pc) == {"timeout": 30}
+        assert pc.queries == 7
+
+    asyncio.run(run())
+
+    print("✅ Remote query cache is refreshed only when needed")
+
+
+class _StubBus:
+    """Stand-in event bus recording fired events."""
+
+    def __init__(self):
+        self.events = []
+
+    def async_fire(self, event_type, event_data):
+        self.events.append((event_type, event_data))
+
+
+def test_shutdown_tracking():
+    """Verify shutdown confirmation, failure detection and deadline learning."""
+    from types import SimpleNamespace
+
+    from pc_power_control import switch
+    from pc_power_control.const import DEFAULT_SHUTDOWN_TIMEOUT, EVENT_SHUTDOWN_FAILED
+
+    def make_switch():
+        pc = _StubPC()
+        entity = switch.PCPowerSwitch(pc)
+        entity.hass = SimpleNamespace(bus=_StubBus())
+        entity.entity_id = "switch.stub_pc"
+        entity.async_write_ha_state = lambda: None
+        return pc, entity
+
+    # Deadline: default until learned, then a multiple of the smoothed duration
+    pc, entity = make_switch()
+    assert entity._shutdown_deadline() == DEFAULT_SHUTDOWN_TIMEOUT
+    entity._record_shutdown_duration(20)
+    assert entity._learned_shutdown_duration == 20
+    assert entity._shutdown_deadline() == 60
+    entity._record_shutdown_duration(5)
+    assert entity._last_shutdown_duration == 5
+    assert entity._learned_shutdown_duration == 15.5
+    assert entity._shutdown_deadline() == 46.5
+    # Never below the minimum
+    entity._learned_shutdown_duration = 4
+    assert entity._shutdown_deadline() == 30
+
+    interval = switch.DEFAULT_SHUTDOWN_PROBE_INTERVAL
+    switch.DEFAULT_SHUTDOWN_PROBE_INTERVAL = 0
+    try:
+        # A single dropped probe does not confirm the shutdown; the recorded
+        # duration is the time of the first probe of the unanswered run
+        pc, entity = make_switch()
+        pc.ping_results = [True, False, True, False, False, False]
+        asyncio.run(entity._async_track_shutdown())
+        assert entity.is_on is False
+        assert entity._last_shutdown_duration == 3
+        assert pc.ping_results == []
+        assert entity.hass.bus.events == []
+
+        # Still answering at the deadline: the shutdown failed
+        pc, entity = make_switch()
+        entity._attr_is_on = False
+        entity._learned_shutdown_duration = 4
+        asyncio.run(entity._async_track_shutdown())
+        assert entity.is_on is True
+        assert entity._last_shutdown_duration is None
+        ((event_type, event_data),) = entity.hass.bus.events
+        assert event_type == EVENT_SHUTDOWN_FAILED
+        assert event_data["elapsed"] == 30 and event_data["deadline"] == 30
+    finally:
+        switch.DEFAULT_SHUTDOWN_PROBE_INTERVAL = interval
+
+    print("✅ Shutdown tracking confirms and learns shutdowns")
+
+
 if __name__ == "__main__":
     print("PC Power Control SSH Command Test")
     print("=" * 40)
@@ -90,6 +279,10 @@ if __name__ == "__main__":
         try:
             # Run the encoding test first
             test_monitor_timeout_command_encoding()
+            test_json_command_encoding()
+            test_parse_json_output()
+            test_cached_remote_query()
+            test_shutdown_tracking()
             success = asyncio.run(test_ssh_command())
             sys.exit(0 if success else 1)
         except AssertionError as ae: